@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+async def bounded_get(url, sem, session):
+    """Request a single URL without following redirects and return its status code"""
+    async with sem:
+        try:
+            async with session.get(url, allow_redirects=False) as resp:
+                # Read the body so the connection goes back to the pool
+                await resp.read()
+                return resp.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"Request to {url} failed: {e}")
+            return None
+
+async def fuzz_all(urls, sem, session):
+    """Request all URLs concurrently and return their status codes in the same order"""
+    return await asyncio.gather(*[bounded_get(url, sem, session) for url in urls])
+
+class AsyncFuzzer:
+    """In-process fuzzer keeping one event loop and connection pool alive across cycles"""
+
+    def __init__(self, concurrency=40, headers=None):
+        self.loop = asyncio.new_event_loop()
+        self.sem, self.session = self.loop.run_until_complete(self._open(concurrency, headers))
+
+    @staticmethod
+    async def _open(concurrency, headers):
+        # Created inside the loop so they are bound to it
+        sem = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60, ssl=False)
+        session = aiohttp.ClientSession(connector=connector, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=30, connect=5))
+        return sem, session
+
+    def run(self, words, target_url):
+        """Fuzz target_url with words and return results shaped like ffuf's JSON output"""
+        words = list(words)
+        urls = [target_url.replace('FUZZ', word) for word in words]
+        logger.info(f"Requesting {len(urls)} URLs in-process")
+        statuses = self.loop.run_until_complete(fuzz_all(urls, self.sem, self.session))
+        return {'results': [{'input': {'FUZZ': word}, 'status': status}
+                            for word, status in zip(words, statuses) if status is not None]}
+
+    def close(self):
+        self.loop.run_until_complete(self.session.close())
+        self.loop.close()
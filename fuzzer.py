@@ -1,16 +1,24 @@
 import sys
 import os
 import requests
-import json
+import requests.adapters
+import orjson
 import subprocess
 import re
 import logging
 import argparse
 import random
-from bs4 import BeautifulSoup
+import shlex
+import threading
+import queue
+import time
+from itertools import chain, islice
+from lxml import html as lxml_html
 from urllib.parse import urljoin, urlparse
 from colorama import init, Fore, Style
+from fuzz_async import AsyncFuzzer
 import urllib3
+from typing import Dict, Iterable, List, Optional, Tuple
 
 urllib3.disable_warnings()
 
@@ -31,15 +39,44 @@ logging.basicConfig(
 if '--debug' in sys.argv:
     logger.setLevel(logging.DEBUG)
 
+# Shared HTTP session, reused across cycles to keep connections alive
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"})
+SESSION_POOL_MAXSIZE = 8
+
+def configure_session(pool_maxsize):
+    """Mount a connection pool able to hold pool_maxsize concurrent connections per host"""
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    SESSION.mount('http://', adapter)
+    SESSION.mount('https://', adapter)
+
+configure_session(SESSION_POOL_MAXSIZE)
+
+# Ollama output is complete once this tag is seen, no need to wait for the rest
+OLLAMA_STOP_TAG = b'</new_files_dirs>'
+
+# Patterns used on every cycle, compiled once
+_NEW_LINKS_RE = re.compile(r'<new_files_dirs>(.*?)</new_files_dirs>', re.DOTALL)
+_URL_RE = re.compile(r'-u\s*["\']?([^"\'\s]+)["\']?')
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.IGNORECASE)
+_NO_CACHE_RE = re.compile(r'\bno-(?:store|cache)\b', re.IGNORECASE)
+
 def extract_links(url):
-    """Extract first 25 links from the main page"""
+    """Extract first 25 links from the main page, along with its headers and status code"""
     try:
         logger.info(f"Attempting to extract links from {url}")
-        response = requests.get(url, verify=False, headers={"User-Agent":"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"})
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = SESSION.get(url, verify=False)
+        # Status of the URL itself, so a redirect (e.g. to a login page) is not taken as a success
+        status = response.history[0].status_code if response.history else response.status_code
         links = []
-        for a in soup.find_all('a', href=True)[:25]:
-            href = a['href']
+        if not response.content.strip():
+            logger.warning("Empty response, no links to extract")
+            return links, dict(response.headers), status
+        # Parse the raw bytes and stop after the first 25 <a href> elements
+        tree = lxml_html.fromstring(response.content)
+        # iter() includes the root, which is the <a> itself for a single-element fragment
+        for a in islice((a for a in tree.iter('a') if a.get('href') is not None), 25):
+            href = a.get('href')
             # Extract path without leading slash
             if href and not href.startswith(('#', 'javascript:', 'mailto:')):
                 # Remove any URL prefix
@@ -52,35 +89,116 @@ def extract_links(url):
                 if href:
                     links.append(href)
         logger.info(f"Successfully extracted {len(links)} links")
-        return links, dict(response.headers)
+        return links, dict(response.headers), status
     except requests.RequestException as e:
         logger.error(f"Network error while extracting links: {e}")
-        return [], {}
+        return [], {}, None
     except Exception as e:
         logger.error(f"Unexpected error while extracting links: {e}", exc_info=True)
-        return [], {}
+        return [], {}, None
 
-def format_headers(headers):
-    """Format headers in the required format"""
-    formatted = []
-    formatted.append("HTTP/1.1 200")
+def cache_max_age(headers: Dict[str, str], ttl: int) -> int:
+    """Return how long the initial links may be cached, given the original response headers
+
+    Cache-Control can only shorten ttl: max-age caps it and no-store/no-cache disable caching.
+    """
     for key, value in headers.items():
-        formatted.append(f"{key}: {value}")
-    return "\n".join(formatted)
+        if key.lower() == 'cache-control' and isinstance(value, str):
+            if _NO_CACHE_RE.search(value):
+                return 0
+            match = _MAX_AGE_RE.search(value)
+            if match:
+                return min(ttl, int(match.group(1)))
+    return ttl
+
+def load_cached_links(cache_file, url, ttl):
+    """Load links and headers saved by a previous run against the same url, if still fresh"""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable links cache {cache_file}: {e}")
+        return None
+    if not isinstance(cache, dict):
+        logger.warning(f"Ignoring malformed links cache {cache_file}")
+        return None
+    if cache.get('url') != url:
+        return None
+    links = cache.get('links', [])
+    headers = cache.get('headers', {})
+    mtime = cache.get('mtime', 0)
+    if not isinstance(links, list) or not isinstance(headers, dict) or not isinstance(mtime, (int, float)):
+        logger.warning(f"Ignoring malformed links cache {cache_file}")
+        return None
+    age = time.time() - mtime
+    if age >= cache_max_age(headers, ttl):
+        logger.info("Cached initial links have expired")
+        return None
+    logger.info(f"Using initial links cached {int(age)}s ago from {cache_file}")
+    return links, headers
+
+def save_cached_links(cache_file, url, links, headers):
+    """Save the initial links and headers so the next run can skip the crawl"""
+    # Session cookies from the target are not needed later, don't leave them on disk
+    headers = {key: value for key, value in headers.items() if key.lower() != 'set-cookie'}
+    try:
+        # Readable by the current user only, the output directory may be shared (/tmp)
+        fd = os.open(cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'wb') as f:
+            f.write(orjson.dumps({"links": links, "headers": headers, "url": url, "mtime": time.time()}))
+    except OSError as e:
+        logger.warning(f"Could not write links cache {cache_file}: {e}")
+
+def format_headers(headers: Dict[str, str]) -> str:
+    """Format headers in the required format"""
+    return "\n".join(chain(("HTTP/1.1 200",), (f"{key}: {value}" for key, value in headers.items())))
 
-def call_ollama(prompt, model):
-    """Call the local Ollama API"""
+def build_prompt(prompt_parts: List[str], all_links_list: List[str], sample_size: int) -> str:
+    """Insert a random sample of the known links between the pieces of the prompt template"""
+    randomized_links = random.sample(all_links_list, min(sample_size, len(all_links_list)))
+    current_prompt = '\n'.join(randomized_links).join(prompt_parts)
+    logger.debug("\nSending prompt to Ollama:")
+    logger.debug(current_prompt)
+    return current_prompt
+
+def call_ollama(prompt: str, model: str) -> str:
+    """Call the local Ollama API, streaming the response until the closing tag is seen"""
     try:
         logger.info(f"Calling Ollama API with model {model}")
-        response = requests.post('http://localhost:11434/api/generate', 
+        response = SESSION.post('http://localhost:11434/api/generate', 
                                 json={
                                     "model": model,
                                     "prompt": prompt,
-                                    "stream": False,
+                                    "stream": True,
                                     "think": False
-                                })
-        response.raise_for_status()
-        result = response.json()['response']
+                                },
+                                stream=True,
+                                timeout=(5, 600))
+        buf = bytearray()
+        try:
+            # Inside the try so the streamed connection is released on HTTP errors too
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if 'error' in chunk:
+                    logger.error(f"Ollama API returned an error: {chunk['error']}")
+                    return ""
+                piece = chunk.get('response', '').encode()
+                buf += piece
+                # Only rescan the tail that could contain a newly completed tag
+                if buf.find(OLLAMA_STOP_TAG, max(0, len(buf) - len(piece) - len(OLLAMA_STOP_TAG))) != -1:
+                    logger.debug("Closing tag received, aborting generation")
+                    break
+                if chunk.get('done'):
+                    break
+        finally:
+            # Closing the stream early makes Ollama stop generating
+            response.close()
+        result = buf.decode('utf-8', errors='replace')
         logger.info("Successfully received response from Ollama API")
         return result
     except requests.RequestException as e:
@@ -90,55 +208,103 @@ def call_ollama(prompt, model):
         logger.error(f"Unexpected error calling Ollama API: {e}", exc_info=True)
         return ""
 
-def extract_new_links(response):
+def start_ollama(prompt: str, model: str) -> queue.Queue:
+    """Run call_ollama in a daemon thread and return the queue its response is put on
+
+    Daemon threads are not joined at exit, so a call still blocked on Ollama (e.g. while
+    the model loads or evaluates the prompt) never delays stopping the fuzzer.
+    """
+    result = queue.Queue(maxsize=1)
+    threading.Thread(target=lambda: result.put(call_ollama(prompt, model)), daemon=True).start()
+    return result
+
+def extract_new_links(response: str) -> List[str]:
     """Extract links from between <new_files_dirs> tags"""
-    pattern = r'<new_files_dirs>(.*?)</new_files_dirs>'
-    match = re.search(pattern, response, re.DOTALL)
+    match = _NEW_LINKS_RE.search(response)
     if match:
-        # Split on newlines and remove empty lines and whitespace
-        return [line.strip() for line in match.group(1).split('\n') if line.strip()]
+        # Split on newlines, remove whitespace and the leading slash (like extract_links
+        # does) so "/admin" and "admin" dedupe against the same tested link
+        links = (line.strip().lstrip('/') for line in match.group(1).split('\n'))
+        return [link for link in links if link]
     return []
 
-def run_ffuf(original_cmd, wordlist, target_url, output):
-    """Run ffuf and return results"""
+def split_ffuf_args(original_cmd: str) -> List[str]:
+    """Split the ffuf command into its arguments, without ffuf itself and the -u/-w options"""
+    # Honour quoted values (e.g. -H "Cookie: a=b") but not backslash escapes or comments,
+    # so regexes like -fr error\d+ and Windows paths pass through untouched
+    lexer = shlex.shlex(original_cmd, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ''
+    lexer.commenters = ''
+    try:
+        parts = list(lexer)
+    except ValueError as e:
+        # e.g. an unbalanced quote in -mr don't, split on whitespace only as before
+        logger.warning(f"Could not parse quotes in command ({e}), splitting it on whitespace instead")
+        parts = original_cmd.split()
+    # Drop the original -u and -w arguments and their values in a single pass
+    cmd_parts = []
+    skip = False
+    for part in parts:
+        if skip:
+            skip = False
+            continue
+        if part in ('-u', '-w'):
+            skip = True
+            continue
+        cmd_parts.append(part)
+
+    # Remove 'ffuf' if it's the first part
+    if cmd_parts and cmd_parts[0] == 'ffuf':
+        cmd_parts = cmd_parts[1:]
+    return cmd_parts
+
+def native_headers(ffuf_args: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Collect the -H headers of the ffuf arguments for the native engine, and the options it ignores"""
+    headers = {}
+    ignored = []
+    args_iter = iter(ffuf_args)
+    for arg in args_iter:
+        if arg == '-H':
+            name, sep, value = next(args_iter, '').partition(':')
+            if sep and name.strip():
+                headers[name.strip()] = value.strip()
+            else:
+                ignored.append(f"-H {name}")
+        elif arg.startswith('-'):
+            ignored.append(arg)
+    return headers, ignored
+
+def run_ffuf(ffuf_args: List[str], words: Iterable[str], target_url: str, output: str) -> Optional[dict]:
+    """Run ffuf on the given words (piped to its stdin) and return results"""
+    output_json = os.path.join(output, 'output.json')
     try:
-        # Split original command into parts
-        cmd_parts = original_cmd.split()
-        # Remove the original -u and -w arguments and their values
-        i = 0
-        while i < len(cmd_parts):
-            if cmd_parts[i] in ['-u', '-w']:
-                cmd_parts.pop(i)  # Remove the argument
-                if i < len(cmd_parts):  # Remove its value
-                    cmd_parts.pop(i)
-                continue
-            i += 1
-        
-        # Remove 'ffuf' if it's the first part
-        if cmd_parts and cmd_parts[0] == 'ffuf':
-            cmd_parts = cmd_parts[1:]
-            
         # Construct new command with all original arguments
-        ffuf_cmd = ['ffuf'] + cmd_parts + ['-w', wordlist, '-u', target_url, '-o', f'{output}/output.json']
+        ffuf_cmd = ['ffuf'] + ffuf_args + ['-w', '-', '-u', target_url, '-o', output_json]
         logger.info(f"Running ffuf command: {' '.join(ffuf_cmd)}")
         
-        result = subprocess.run(ffuf_cmd, capture_output=True, text=True)
+        # Feed the wordlist through stdin instead of a file on disk
+        result = subprocess.run(ffuf_cmd, input='\n'.join(words), capture_output=True, text=True)
         if result.returncode != 0:
             logger.error(f"ffuf command failed: {result.stderr}")
             return None
         
-        if not os.path.exists(f'{output}/output.json') or os.stat(f'{output}/output.json').st_size == 0:
+        try:
+            st = os.stat(output_json)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_size == 0:
             logger.warning("ffuf produced no output")
             return None        
             
-        with open(f'{output}/output.json', 'r') as f:
-            data = json.load(f)
+        with open(output_json, 'rb') as f:
+            data = orjson.loads(f.read())
             #logger.info(f"Successfully parsed ffuf results")
             return data
     except FileNotFoundError:
         logger.error("ffuf command not found. Please ensure it's installed and in PATH")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error parsing ffuf output JSON: {e}")
         return None
     except Exception as e:
@@ -165,19 +331,32 @@ def main():
     parser.add_argument('-c', '--cycles', type=int, default=50, help='Number of fuzzing cycles to run (default: 50)')
     parser.add_argument('-m', '--model', default='qwen3:4b-instruct', help='Ollama model to use (default: qwen3:4b-instruct)')
     parser.add_argument('-o', '--output', default='/tmp/brainstorm', help='The output directory for links & ffuf files (default: /tmp/brainstorm)')
+    parser.add_argument('-p', '--parallel', type=int, default=1, help='Number of concurrent Ollama prompts per cycle (default: 1)')
+    parser.add_argument('-e', '--engine', choices=['ffuf', 'native'], default='ffuf',
+                    help='Fuzzing engine: spawn ffuf each cycle, or send the requests in-process over persistent connections (only -u and -H are taken from the command) (default: ffuf)')
+    parser.add_argument('--concurrency', type=int, default=40, help='Number of concurrent requests for the native engine (default: 40)')
+    parser.add_argument('--prompt-link-sample', type=int, default=200, help='Maximum number of known links included in each prompt (default: 200)')
     parser.add_argument('--prompt-file', default='prompts/files.txt', help='Path to prompt file (default: prompts/files.txt)')
+    parser.add_argument('--cache-ttl', type=int, default=3600,
+                    help='Seconds to reuse the initial links cached in the output directory, 0 to disable. A shorter Cache-Control max-age from the target, or no-store/no-cache, takes precedence (default: 3600)')
     parser.add_argument('--status-codes', type=str, default='200,301,302,303,307,308,403,401,500',
                     help='Comma-separated list of status codes to consider as successful (default: 200,301,302,303,307,308,403,401,500)')    
     parser.add_argument('-V', '--version', action='version', version=f"%(prog)s {__version__}")
 
     args = parser.parse_args()
+    if args.parallel < 1:
+        parser.error('--parallel must be at least 1')
+    if args.prompt_link_sample < 1:
+        parser.error('--prompt-link-sample must be at least 1')
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
 
     logger.info("Starting fuzzer application")
 
     # Parse command line argument
     cmd = sys.argv[1]
     # Try to match URL with double quotes, single quotes, or no quotes
-    url_match = re.search(r'-u\s*["\']?([^"\'\s]+)["\']?', cmd)
+    url_match = _URL_RE.search(cmd)
     if not url_match:
         logger.error("Could not extract URL from command")
         print("Could not extract URL from command")
@@ -185,13 +364,16 @@ def main():
     
     logger.info(f"Extracted base URL from command: {url_match.group(1)}")
 
+    # Tokenise the rest of the command once, instead of on every cycle
+    ffuf_args = split_ffuf_args(cmd)
+
     base_url = url_match.group(1).replace('FUZZ', '')
     considered_status_codes = [int(code) for code in args.status_codes.split(',')]
     
     # Initial setup
     try:
         output = args.output
-        if re.search('/$', output):
+        if output.endswith('/'):
             output = output.rstrip('/')
 
         os.mkdir(output)
@@ -199,7 +381,17 @@ def main():
     except FileExistsError:
         logger.info(f"{output} already exists.")
 
-    initial_links, headers = extract_links(base_url)
+    cache_file = os.path.join(output, 'initial_links.json')
+    cached = load_cached_links(cache_file, base_url, args.cache_ttl) if args.cache_ttl > 0 else None
+    if cached:
+        initial_links, headers = cached
+    else:
+        initial_links, headers, status = extract_links(base_url)
+        # Only cache a successful crawl, and not when the server asked not to cache it
+        if status is not None and 200 <= status < 300 and cache_max_age(headers, args.cache_ttl) > 0:
+            save_cached_links(cache_file, base_url, initial_links, headers)
+        elif status is not None and not 200 <= status < 300:
+            logger.info(f"Not caching initial links, {base_url} returned status {status}")
     unique_initial_links = set(initial_links)
     print(f"\n{Fore.LIGHTBLACK_EX}Initial unique links extracted from website:{Style.RESET_ALL}")
     for link in sorted(unique_initial_links):
@@ -207,6 +399,7 @@ def main():
     print()
     
     all_links = set(initial_links)  # all links including tried ones
+    all_links_list = list(all_links) # same links, kept as a list for sampling
     new_discovered_links = set()    # only links discovered by ffuf
     tested_links = set()           # links that were tested with ffuf
     server_headers = format_headers(headers)
@@ -219,64 +412,94 @@ def main():
         print(f"Error reading prompt file: {e}")
         return
 
+    # Server headers never change, substitute them once and split the template
+    # at every links placeholder so each cycle only has to do a single join
+    ollama_prompt = ollama_prompt.replace('{{serverHeaders}}', server_headers)
+    prompt_parts = ollama_prompt.split('{{initialLinks}}')
+
+    # Links are appended as they are discovered instead of rewriting the whole file
+    all_links_file = open(os.path.join(output, 'all_links.txt'), 'w', buffering=1 << 16)
+    if all_links_list:
+        all_links_file.write('\n'.join(all_links_list) + '\n')
+        all_links_file.flush()
+
     cycle = 0
     max_cycles = args.cycles
 
-    while cycle < max_cycles:
-        try:
+    # Ollama runs in background threads so the next suggestions are generated
+    # while ffuf is testing the current ones
+    ollama_results = None
+
+    if args.parallel > SESSION_POOL_MAXSIZE:
+        configure_session(args.parallel)
+
+    # The native engine keeps one pool of connections to the target for the whole run
+    native_fuzzer = None
+    if args.engine == 'native':
+        headers, ignored = native_headers(ffuf_args)
+        if ignored:
+            logger.warning(f"The native engine only uses -u and -H from the command, ignoring: {' '.join(ignored)}. "
+                           f"Results are only filtered with --status-codes ({args.status_codes})")
+        native_fuzzer = AsyncFuzzer(concurrency=args.concurrency, headers={'User-Agent': SESSION.headers['User-Agent'], **headers})
+
+    # call_ollama and run_ffuf handle their own errors, only the remaining I/O is
+    # guarded inside the loop so unexpected bugs surface instead of retrying forever
+    try:
+        while cycle < max_cycles:
             #logger.info(f"Starting cycle {cycle + 1}/{max_cycles}")
             print(f"\nCycle {cycle + 1}/{max_cycles}")
-            
-            # Prepare prompt with randomized link order
-            randomized_links = list(all_links)
-            random.shuffle(randomized_links)
-            current_prompt = ollama_prompt.replace('{{initialLinks}}', 
-                                                    '\n'.join(randomized_links))
-            current_prompt = current_prompt.replace('{{serverHeaders}}', 
-                                                    server_headers)
-            
-            # Call Ollama API
-            if args.debug:
-                logger.debug("\nSending prompt to Ollama:")
-                logger.debug(current_prompt)
-                
-            response = call_ollama(current_prompt, model=args.model)
-            
+
+            if ollama_results is None:
+                ollama_results = [start_ollama(build_prompt(prompt_parts, all_links_list, args.prompt_link_sample), args.model)
+                                  for _ in range(args.parallel)]
+
+            responses = [result.get() for result in ollama_results]
+            ollama_results = None
+
             if args.debug:
-                logger.debug("\nOllama response:")
-                logger.debug(response)
-                
-            new_links = extract_new_links(response)
-            
+                for response in responses:
+                    logger.debug("\nOllama response:")
+                    logger.debug(response)
+
             # Update links
-            # Filter out links that have already been tested
-            new_unique_links = set(new_links) - all_links
+            # Filter out links that have already been tested, without building temporary sets
+            new_unique_links = set().union(*(extract_new_links(response) for response in responses))
+            new_unique_links.difference_update(all_links)
             untested_links = new_unique_links - tested_links
 
             # add to tested links
-            tested_links.update(new_unique_links)
-            
-            if untested_links:
-                if args.debug:
-                    logger.debug("\nNew untested links suggested by Ollama:")
-                    for link in untested_links:
-                        logger.debug(f" {link}")
-                with open(f'{output}/links.txt', 'w') as f:
-                    f.write('\n'.join(untested_links))
-            
-            # Run ffuf with original command
-            ffuf_results = run_ffuf(cmd, f'{output}/links.txt', url_match.group(1), output)
+            tested_links |= new_unique_links
+
+            if untested_links and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\nNew untested links suggested by Ollama:\n" + '\n'.join(f" {link}" for link in untested_links))
+
+            # Start the next Ollama calls before running ffuf so both overlap
+            if cycle + 1 < max_cycles:
+                ollama_results = [start_ollama(build_prompt(prompt_parts, all_links_list, args.prompt_link_sample), args.model)
+                                  for _ in range(args.parallel)]
+
+            # Run ffuf with original command, unless nothing new was suggested
+            ffuf_results = None
+            if untested_links and native_fuzzer is not None:
+                try:
+                    ffuf_results = native_fuzzer.run(untested_links, url_match.group(1))
+                except Exception as e:
+                    logger.error(f"Unexpected error running native fuzzer: {e}", exc_info=True)
+            elif untested_links:
+                ffuf_results = run_ffuf(ffuf_args, untested_links, url_match.group(1), output)
+            else:
+                logger.info("No untested links this cycle, skipping ffuf")
             if ffuf_results and 'results' in ffuf_results:
                 if args.debug:
                     logger.debug("\nffuf results:")
-                    logger.debug(json.dumps(ffuf_results, indent=2))
-                
+                    logger.debug(orjson.dumps(ffuf_results, option=orjson.OPT_INDENT_2).decode())
+
                 fuzz_links = set()
                 for result in ffuf_results['results']:
-                    tested_url = result['input']['FUZZ']                    
+                    tested_url = result['input']['FUZZ']
                     if result['status'] in considered_status_codes:
                         fuzz_links.add(tested_url)
-                
+
                 # Update discovered links
                 new_discovered = fuzz_links - all_links
                 if new_discovered:
@@ -284,23 +507,29 @@ def main():
                     for link in new_discovered:
                         print(f"  {Fore.GREEN}{link}{Style.RESET_ALL}")
                     all_links.update(new_discovered)
+                    all_links_list.extend(new_discovered)
                     new_discovered_links.update(new_discovered)
-                
-                # Save all discovered links to file
-                with open(f'{output}/all_links.txt', 'w') as f:
-                    f.write('\n'.join(sorted(all_links)))
-            
+
+                    # Append the new links to file
+                    try:
+                        all_links_file.write('\n'.join(new_discovered) + '\n')
+                        all_links_file.flush()
+                    except OSError as e:
+                        logger.error(f"Error writing {all_links_file.name}: {e}")
+
             cycle += 1
-            
-        except KeyboardInterrupt:
-            logger.info("Fuzzer stopped by user")
-            print(f"\n{Fore.RED}Stopping fuzzer...{Style.RESET_ALL}")
-            display_results(tested_links, new_discovered_links)
-            break
-        except Exception as e:
-            print(f"Error in cycle {cycle}: {e}")
-            continue
-    
+
+    except KeyboardInterrupt:
+        logger.info("Fuzzer stopped by user")
+        print(f"\n{Fore.RED}Stopping fuzzer...{Style.RESET_ALL}")
+        display_results(tested_links, new_discovered_links)
+    finally:
+        # In-flight Ollama calls run in daemon threads, they are dropped at exit and
+        # their connections closed, which also stops the generation
+        if native_fuzzer is not None:
+            native_fuzzer.close()
+        all_links_file.close()
+
     # Display final results after all cycles complete
     if cycle >= max_cycles:
         display_results(tested_links, new_discovered_links)
@@ -1,13 +1,16 @@
 import sys
 import os
 import requests
-import json
+import requests.adapters
+import orjson
 import subprocess
 import re
 import logging
 import argparse
 import random
+import shlex
 from colorama import init, Fore, Style
+from typing import Iterable, List, Optional
 
 __version__: str = '1.4'
 
@@ -26,19 +29,56 @@ logging.basicConfig(
 if '--debug' in sys.argv:
     logger.setLevel(logging.DEBUG)
 
-def call_ollama(prompt, model):
-    """Call the local Ollama API"""
+# Shared HTTP session, reused across cycles to keep connections alive
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"})
+adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+SESSION.mount('http://', adapter)
+SESSION.mount('https://', adapter)
+
+# Ollama output is complete once this tag is seen, no need to wait for the rest
+OLLAMA_STOP_TAG = b'</full_filenames>'
+
+# Patterns used on every cycle, compiled once
+_FILENAMES_RE = re.compile(r'<full_filenames>(.*?)</full_filenames>', re.DOTALL)
+_URL_RE = re.compile(r'-u\s*["\']?([^"\'\s]+)["\']?')
+
+def call_ollama(prompt: str, model: str) -> str:
+    """Call the local Ollama API, streaming the response until the closing tag is seen"""
     try:
         logger.info(f"Calling Ollama API with model {model}")
-        response = requests.post('http://localhost:11434/api/generate', 
+        response = SESSION.post('http://localhost:11434/api/generate', 
                                 json={
                                     "model": model,
                                     "prompt": prompt,
-                                    "stream": False,
+                                    "stream": True,
                                     "think": False
-                                })
-        response.raise_for_status()
-        result = response.json()['response']
+                                },
+                                stream=True,
+                                timeout=(5, 600))
+        buf = bytearray()
+        try:
+            # Inside the try so the streamed connection is released on HTTP errors too
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if 'error' in chunk:
+                    logger.error(f"Ollama API returned an error: {chunk['error']}")
+                    return ""
+                piece = chunk.get('response', '').encode()
+                buf += piece
+                # Only rescan the tail that could contain a newly completed tag
+                if buf.find(OLLAMA_STOP_TAG, max(0, len(buf) - len(piece) - len(OLLAMA_STOP_TAG))) != -1:
+                    logger.debug("Closing tag received, aborting generation")
+                    break
+                if chunk.get('done'):
+                    break
+        finally:
+            # Closing the stream early makes Ollama stop generating
+            response.close()
+        result = buf.decode('utf-8', errors='replace')
         logger.info("Successfully received response from Ollama API")
         return result
     except requests.RequestException as e:
@@ -48,54 +88,74 @@ def call_ollama(prompt, model):
         logger.error(f"Unexpected error calling Ollama API: {e}", exc_info=True)
         return ""
 
-def extract_filenames(response):
+def extract_filenames(response: str) -> List[str]:
     """Extract filenames from between <full_filenames> tags"""
-    pattern = r'<full_filenames>(.*?)</full_filenames>'
-    match = re.search(pattern, response, re.DOTALL)
+    match = _FILENAMES_RE.search(response)
     if match:
         # Split on newlines and remove empty lines and whitespace
         return [line.strip() for line in match.group(1).split('\n') if line.strip()]
     return []
 
-def run_ffuf(original_cmd, wordlist, target_url, output):
-    """Run ffuf and return results"""
+def split_ffuf_args(original_cmd: str) -> List[str]:
+    """Split the ffuf command into its arguments, without ffuf itself and the -u/-w options"""
+    # Honour quoted values (e.g. -H "Cookie: a=b") but not backslash escapes or comments,
+    # so regexes like -fr error\d+ and Windows paths pass through untouched
+    lexer = shlex.shlex(original_cmd, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ''
+    lexer.commenters = ''
+    try:
+        parts = list(lexer)
+    except ValueError as e:
+        # e.g. an unbalanced quote in -mr don't, split on whitespace only as before
+        logger.warning(f"Could not parse quotes in command ({e}), splitting it on whitespace instead")
+        parts = original_cmd.split()
+    # Drop the original -u and -w arguments and their values in a single pass
+    cmd_parts = []
+    skip = False
+    for part in parts:
+        if skip:
+            skip = False
+            continue
+        if part in ('-u', '-w'):
+            skip = True
+            continue
+        cmd_parts.append(part)
+
+    # Remove 'ffuf' if it's the first part
+    if cmd_parts and cmd_parts[0] == 'ffuf':
+        cmd_parts = cmd_parts[1:]
+    return cmd_parts
+
+def run_ffuf(ffuf_args: List[str], words: Iterable[str], target_url: str, output: str) -> Optional[dict]:
+    """Run ffuf on the given words (piped to its stdin) and return results"""
+    output_json = os.path.join(output, 'output.json')
     try:
-        # Split original command into parts
-        cmd_parts = original_cmd.split()
-        # Remove the original -u and -w arguments and their values
-        i = 0
-        while i < len(cmd_parts):
-            if cmd_parts[i] in ['-u', '-w']:
-                cmd_parts.pop(i)  # Remove the argument
-                if i < len(cmd_parts):  # Remove its value
-                    cmd_parts.pop(i)
-                continue
-            i += 1
-        
-        # Remove 'ffuf' if it's the first part
-        if cmd_parts and cmd_parts[0] == 'ffuf':
-            cmd_parts = cmd_parts[1:]
-            
         # Construct new command with all original arguments
-        ffuf_cmd = ['ffuf'] + cmd_parts + ['-w', wordlist, '-u', target_url, '-o', f'{output}/output.json']
+        ffuf_cmd = ['ffuf'] + ffuf_args + ['-w', '-', '-u', target_url, '-o', output_json]
         logger.info(f"Running ffuf command: {' '.join(ffuf_cmd)}")
         
-        result = subprocess.run(ffuf_cmd, capture_output=True, text=True)
+        # Feed the wordlist through stdin instead of a file on disk
+        result = subprocess.run(ffuf_cmd, input='\n'.join(words), capture_output=True, text=True)
         if result.returncode != 0:
             logger.error(f"ffuf command failed: {result.stderr}")
             return None
         
-        if not os.path.exists(f'{output}/output.json') or os.stat(f'{output}/output.json').st_size == 0:
+        try:
+            st = os.stat(output_json)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_size == 0:
             logger.warning("ffuf produced no output")
             return None        
             
-        with open(f'{output}/output.json', 'r') as f:
-            data = json.load(f)
+        with open(output_json, 'rb') as f:
+            data = orjson.loads(f.read())
             return data
     except FileNotFoundError:
         logger.error("ffuf command not found. Please ensure it's installed and in PATH")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error parsing ffuf output JSON: {e}")
         return None
     except Exception as e:
@@ -134,18 +194,21 @@ def main():
     # Parse command line argument
     cmd = args.command
     # Try to match URL with double quotes, single quotes, or no quotes
-    url_match = re.search(r'-u\s*["\']?([^"\'\s]+)["\']?', cmd)
+    url_match = _URL_RE.search(cmd)
     if not url_match:
         logger.error("Could not extract URL from command")
         print("Could not extract URL from command")
         return
     
     logger.info(f"Extracted base URL from command: {url_match.group(1)}")
+
+    # Tokenise the rest of the command once, instead of on every cycle
+    ffuf_args = split_ffuf_args(cmd)
     
     # Initial setup
     try:
         output = args.output
-        if re.search('/$', output):
+        if output.endswith('/'):
             output = output.rstrip('/')
 
         os.mkdir(output)
@@ -167,16 +230,21 @@ def main():
         print(f"Error reading prompt file: {e}")
         return
 
+    # Prepare prompt with filename, it is the same for every cycle
+    current_prompt = ollama_prompt.replace('{{INPUT_83_FILENAME}}', args.filename)
+
+    # Filenames are appended as they are discovered instead of rewriting the whole file
+    all_filenames_file = open(os.path.join(output, 'all_filenames.txt'), 'w', buffering=1 << 16)
+
     cycle = 0
     max_cycles = args.cycles
 
-    while cycle < max_cycles:
-        try:
+    # call_ollama and run_ffuf handle their own errors, only the remaining I/O is
+    # guarded inside the loop so unexpected bugs surface instead of retrying forever
+    try:
+        while cycle < max_cycles:
             print(f"\nCycle {cycle + 1}/{max_cycles}")
             
-            # Prepare prompt with filename
-            current_prompt = ollama_prompt.replace('{{INPUT_83_FILENAME}}', args.filename)
-            
             # Call Ollama API
             if args.debug:
                 logger.debug("\nSending prompt to Ollama:")
@@ -195,27 +263,27 @@ def main():
                 print(f"  {Fore.GREEN}{filename}{Style.RESET_ALL}")
             
             # Update filenames
-            # Filter out filenames that have already been tested
-            new_unique_filenames = set(new_filenames) - all_filenames
+            # Filter out filenames that have already been tested, without building temporary sets
+            new_unique_filenames = set(new_filenames)
+            new_unique_filenames.difference_update(all_filenames)
             untested_filenames = new_unique_filenames - tested_filenames
 
             # add to tested filenames
-            tested_filenames.update(new_unique_filenames)
-            
+            tested_filenames |= new_unique_filenames
+
+            if untested_filenames and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\nNew untested filenames suggested by Ollama:\n" + '\n'.join(f" {filename}" for filename in untested_filenames))
+
+            # Run ffuf with original command, unless nothing new was suggested
+            ffuf_results = None
             if untested_filenames:
-                if args.debug:
-                    logger.debug("\nNew untested filenames suggested by Ollama:")
-                    for filename in untested_filenames:
-                        logger.debug(f" {filename}")
-                with open(f'{output}/links.txt', 'w') as f:
-                    f.write('\n'.join(untested_filenames))
-            
-            # Run ffuf with original command
-            ffuf_results = run_ffuf(cmd, f'{output}/links.txt', url_match.group(1), output)
+                ffuf_results = run_ffuf(ffuf_args, untested_filenames, url_match.group(1), output)
+            else:
+                logger.info("No untested filenames this cycle, skipping ffuf")
             if ffuf_results and 'results' in ffuf_results:
                 if args.debug:
                     logger.debug("\nffuf results:")
-                    logger.debug(json.dumps(ffuf_results, indent=2))
+                    logger.debug(orjson.dumps(ffuf_results, option=orjson.OPT_INDENT_2).decode())
                 
                 fuzz_filenames = set()
                 for result in ffuf_results['results']:
@@ -231,21 +299,22 @@ def main():
                         print(f"  {Fore.GREEN}{filename}{Style.RESET_ALL}")
                     all_filenames.update(new_discovered)
                     new_discovered_filenames.update(new_discovered)
-                
-                # Save all discovered filenames to file
-                with open(f'{output}/all_filenames.txt', 'w') as f:
-                    f.write('\n'.join(sorted(all_filenames)))
+
+                    # Append the new filenames to file
+                    try:
+                        all_filenames_file.write('\n'.join(new_discovered) + '\n')
+                        all_filenames_file.flush()
+                    except OSError as e:
+                        logger.error(f"Error writing {all_filenames_file.name}: {e}")
             
             cycle += 1
-            
-        except KeyboardInterrupt:
-            logger.info("Fuzzer stopped by user")
-            print(f"\n{Fore.RED}Stopping fuzzer...{Style.RESET_ALL}")
-            display_results(tested_filenames, new_discovered_filenames)
-            break
-        except Exception as e:
-            print(f"Error in cycle {cycle}: {e}")
-            continue
+
+    except KeyboardInterrupt:
+        logger.info("Fuzzer stopped by user")
+        print(f"\n{Fore.RED}Stopping fuzzer...{Style.RESET_ALL}")
+        display_results(tested_filenames, new_discovered_filenames)
+    finally:
+        all_filenames_file.close()
     
     # Display final results after all cycles complete
     if cycle >= max_cycles: